@@ -1,8 +1,14 @@
 """Utility functions and definitions to manipulate ArtifactDB IDs (AIDs)."""
 
 import logging
-from re import match
-from typing import Dict, List, Tuple
+import re
+from collections import namedtuple
+from functools import lru_cache
+from typing import Dict, Tuple
+
+# compiled once at import time, so unpack_id() doesn't pay the re internal
+# cache lookup on every call
+_GPRN_ID_RE = re.compile(r"^(gprn(?::.*?){5}.*?):(.*)@([.\w\d-]+)")
 
 
 class MalformedID(Exception):
@@ -13,7 +19,46 @@ class MalformedKey(Exception):
     """An exception for a malformed S3 key."""
 
 
-def parse_key(key: str) -> Dict[str, str]:
+class _PartsAccessMixin:
+    """Allow dict-style access (`parts["version"]`, `parts.get("version")`)
+    on parsed named tuples, so callers written against the historical `dict`
+    return values keep working. Hyphenated keys (GPRN spec names like
+    `"type-id"`) map to the matching underscored field."""
+
+    __slots__ = ()
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            try:
+                return getattr(self, key.replace("-", "_"))
+            except AttributeError:
+                raise KeyError(key) from None
+        return super().__getitem__(key)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+
+class ParsedAID(_PartsAccessMixin, namedtuple("ParsedAID", ("project_id", "path", "version"))):
+    """An unpacked ArtifactDB ID."""
+    __slots__ = ()
+
+
+class ParsedKey(_PartsAccessMixin, namedtuple("ParsedKey", ("project_id", "metapath", "version"))):
+    """A parsed S3 key pointing to an ArtifactDB metadata file."""
+    __slots__ = ()
+
+
+class ParsedArn(_PartsAccessMixin, namedtuple("ParsedArn", ("project_id", "path", "version", "bucket"))):
+    """A parsed S3 ARN, ie. a parsed key plus the bucket it lives in."""
+    __slots__ = ()
+
+
+@lru_cache(maxsize=8192)
+def parse_key(key: str) -> ParsedKey:
     """Parse an S3 key pointing to an ArtifactDB file.
 
     Parameters
@@ -23,32 +68,25 @@ def parse_key(key: str) -> Dict[str, str]:
 
     Returns
     -------
-    parsed_key : Dict[str, str]
-        A `dict` with the keys: `"project_id"`, `"metapath"`, and `"version"`.
+    parsed_key : ParsedKey
+        A named tuple with the fields: `"project_id"`, `"metapath"`, and
+        `"version"` (dict-style access is supported too). Results are cached,
+        keys are frequently re-parsed in bulk operations.
         Note: `"metapath"` is the path to metadata file describing the
         ArtifactDB file, not the resource file. It is different from `"path"`
         in the metadata file itself.
     """
-    matches = match(r"^/?(.*?)/(.*?)/(.*)", key)
-    if matches is None:
+    # cheaper than a regex: cut the key at the first two "/"
+    parts = (key[1:] if key.startswith("/") else key).split("/", 2)
+    if len(parts) != 3:
         raise MalformedKey("S3 key could not be parsed.")
+    project_id, version, metapath = parts
 
-    project_id, version, metapath = matches.groups()
-
-    errors: List[str] = []
-    if not isinstance(project_id, str):
-        errors.append(f"Can't unpack project ID from {key}")
-    if not isinstance(metapath, str):
-        errors.append(f"Can't unpack metapath from {key}")
-    if not isinstance(version, str):
-        errors.append(f"Can't unpack version from {key}")
-    if len(errors) > 0:
-        raise MalformedKey(" ".join(errors))
+    return ParsedKey(project_id, metapath, version)
 
-    return {"project_id": project_id, "metapath": metapath, "version": version}
 
-
-def unpack_id(_id: str) -> Dict[str, str]:
+@lru_cache(maxsize=8192)
+def unpack_id(_id: str) -> ParsedAID:
     """Unpack an ArtifactDB ID.
 
     Parameters
@@ -58,9 +96,11 @@ def unpack_id(_id: str) -> Dict[str, str]:
 
     Returns
     -------
-    unpacked_aid : Dict[str, str]
-        The unpacked ArtifactDB ID in the form of a `dict` with keys:
-        `"project_id"`, `"path"`, and `"version"`.
+    unpacked_aid : ParsedAID
+        The unpacked ArtifactDB ID as a named tuple with fields:
+        `"project_id"`, `"path"`, and `"version"` (dict-style access is
+        supported too). Results are cached, the same IDs are re-parsed
+        over and over in listings and lineage walks.
     """
     try:
         if _id.startswith("gprn:"):
@@ -79,17 +119,33 @@ def unpack_id(_id: str) -> Dict[str, str]:
             # That said... the parsing result in the end is not correct... Assuming that code is dead for now, with a warning
             # to see if it resurrects...
             logging.critical(f"Parsing an ArtifactDB ID starting with a `gprn:` notation, not supported: {_id!r}")
-            project_id, _, path, version = match(r"^(gprn(:.*?){5}.*?):(.*)@([.\w\d-]+)",_id).groups()
+            project_id, path, version = _GPRN_ID_RE.match(_id).groups()
         else:
-            project_id, path, version = match(r"^(.*?):(.*?)@([.\w\d-]+)",_id).groups()
-        assert project_id, "can't unpack project_id from '%s'" % _id
-        assert path, "can't unpack path from '%s'" % _id
-        assert version, "can't unpack version from '%s'" % _id
-
-        return {"project_id": project_id, "path": path, "version": version}
+            # "<project_id>:<path>@<version>": locating the first ":" and the
+            # last "@" is all the regex did, str.find/rfind do it without the
+            # regex engine
+            i = _id.find(":")
+            j = _id.rfind("@")
+            if i < 0 or j < i:
+                raise MalformedID(f"Unable to parse ID: {_id!r}")
+            project_id = _id[:i]
+            path = _id[i + 1:j]
+            version = _id[j + 1:]
+            # same character class as the old regex, [.\w\d-]: alphanumerics
+            # plus ".", "_" and "-"
+            if not version.replace("-", "").replace(".", "").replace("_", "").isalnum():
+                raise MalformedID(f"can't unpack version from '{_id}'")
+        # explicit checks instead of asserts: they survive `python -O` and
+        # the failure messages are only formatted when actually raised
+        if not project_id:
+            raise MalformedID(f"can't unpack project_id from '{_id}'")
+        if not path:
+            raise MalformedID(f"can't unpack path from '{_id}'")
+        if not version:
+            raise MalformedID(f"can't unpack version from '{_id}'")
+
+        return ParsedAID(project_id, path, version)
 
-    except AssertionError as exc:
-        raise MalformedID(exc)
     except AttributeError as exc:
         raise MalformedID(f"Unable to parse ID: {exc}")
 
@@ -99,9 +155,10 @@ def _get_parts(parts: Dict[str, str]) -> Tuple[str, str, str]:
 
     Parameters
     ----------
-    parts : Dict[str, str]
-        The unpacked ArtifactDB ID in the form of a `dict` with keys:
-        `"project_id"`, `"path"`, and `"version"`.
+    parts : Dict[str, str] or ParsedAID
+        The unpacked ArtifactDB ID, either a `dict` with keys
+        `"project_id"`, `"path"`, and `"version"`, or a parsed named tuple
+        with the same fields.
 
     Returns
     -------
@@ -112,6 +169,12 @@ def _get_parts(parts: Dict[str, str]) -> Tuple[str, str, str]:
     version : str
         The version of the project.
     """
+    try:
+        # parsed named tuples: plain attribute loads, no per-key dict lookup
+        return parts.project_id, parts.path, parts.version
+    except AttributeError:
+        pass
+
     try:
         project_id = parts["project_id"]
     except KeyError as exc:
@@ -139,9 +202,10 @@ def pack_id(parts: Dict[str, str]) -> str:
 
     Parameters
     ----------
-    parts : Dict[str, str]
-        The unpacked ArtifactDB ID in the form of a `dict` with keys:
-        `"project_id"`, `"path"`, and `"version"`.
+    parts : Dict[str, str] or ParsedAID
+        The unpacked ArtifactDB ID, either a `dict` with keys
+        `"project_id"`, `"path"`, and `"version"`, or a parsed named tuple
+        with the same fields.
 
     Returns
     -------
@@ -165,7 +229,8 @@ def generate_id(artifact_doc):
     return pack_id(ids)
 
 
-def parse_arn(arn: str) -> Dict[str, str]:
+@lru_cache(maxsize=8192)
+def parse_arn(arn: str) -> ParsedArn:
     """Parse an S3 key with a prepended bucket.
 
     Parameters
@@ -175,15 +240,21 @@ def parse_arn(arn: str) -> Dict[str, str]:
 
     Returns
     -------
-    unpacked_arn : Dict[str, str]
-        The unpacked ArtifactDB ID in the form of a `dict` with keys:
-        `"project_id"`, `"path"`, `"version"`, and `"bucket"`.
+    unpacked_arn : ParsedArn
+        The unpacked ArtifactDB ID as a named tuple with fields:
+        `"project_id"`, `"path"`, `"version"`, and `"bucket"` (dict-style
+        access is supported too). Results are cached.
     """
-    bucket, key = arn.split(":")[5:][0].split("/", maxsplit=1)
+    # skip the 5 leading ":"-separated ARN fields without building
+    # intermediate lists, the bucket and key sit right after
+    i = -1
+    for _ in range(5):
+        i = arn.index(":", i + 1)
+    slash = arn.index("/", i + 1)
+    bucket = arn[i + 1:slash]
+    key = arn[slash + 1:]
     ids = parse_key(key)
-    ids["path"] = ids.pop("metapath")
-    ids["bucket"] = bucket
-    return ids
+    return ParsedArn(ids.project_id, ids.metapath, ids.version, bucket)
 
 
 def generate_key(parts: Dict[str, str]) -> str:
@@ -191,9 +262,10 @@ def generate_key(parts: Dict[str, str]) -> str:
 
     Parameters
     ----------
-    parts : Dict[str, str]
-        The unpacked ArtifactDB ID in the form of a `dict` with keys:
-        `"project_id"`, `"path"`, and `"version"`.
+    parts : Dict[str, str] or ParsedAID
+        The unpacked ArtifactDB ID, either a `dict` with keys
+        `"project_id"`, `"path"`, and `"version"`, or a parsed named tuple
+        with the same fields.
 
     Returns
     -------
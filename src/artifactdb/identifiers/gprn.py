@@ -2,9 +2,11 @@
 Utility functions to manipulate Genomics Platform Resource Names (GPRNs)
 """
 
-import copy
+import sys
+from collections import namedtuple
+from functools import lru_cache
 
-from .aid import unpack_id, pack_id
+from .aid import unpack_id, pack_id, _PartsAccessMixin
 
 
 class GPRNError(Exception): pass
@@ -13,53 +15,51 @@ class UnsupportedTypeID(GPRNError): pass
 class NoSuchGPRN(GPRNError): pass
 
 
-VALID_TYPE_IDS = ("artifact", "project", "doc", "changelog", "backup")
+# interned, so comparing a parsed (and equally interned) type-id against them
+# is a pointer comparison; frozenset makes the membership check a single
+# hash lookup instead of a linear scan
+VALID_TYPE_IDS = frozenset(sys.intern(_t) for _t in ("artifact", "project", "doc", "changelog", "backup"))
 
+
+class GprnParts(_PartsAccessMixin, namedtuple("GprnParts",
+        ("environment", "service", "placeholder", "type_id", "resource_id"))):
+    """A parsed GPRN. The spec keys `"type-id"` and `"resource-id"` remain
+    available through dict-style access."""
+    __slots__ = ()
+
+
+@lru_cache(maxsize=4096)
 def parse(gprn):
     """
-    Return a dict where keys follow the GPRN spec
+    Return a GprnParts named tuple where fields follow the GPRN spec.
+    Results are cached, lineage walks re-parse the same GPRNs repeatedly.
     """
-    parsed = {
-        "environment": "prd",  # default if not specified, empty means "prd"
-        "service": None,
-        "placeholder": None,
-        "type-id": None,
-        "resource-id": None,
-    }
-
-    parts = gprn.split(":")
-    prefix = parts[0]
-    if prefix != "gprn":
-        raise FormatError(f"Expecting prefix 'gprn', got '{prefix}'")
-    if len(parts) == 2:
-        parsed["environment"] = parts[1]
-        return parsed
-    prefix = parts.pop(0)
-    if prefix != "gprn":
-        raise FormatError(f"Expecting prefix 'gprn', got '{prefix}'")
-    env = parts and parts.pop(0)
-    if env:
-        parsed["environment"] = env
-    svc = parts and parts.pop(0)
-    if not svc:
+    # split at most 5 times: the resource-id can contain ":", so whatever
+    # sits past the 5th separator is the resource-id, already in one piece
+    parts = gprn.split(":", 5)
+    if parts[0] != "gprn":
+        raise FormatError(f"Expecting prefix 'gprn', got '{parts[0]}'")
+    nparts = len(parts)
+    if nparts == 2:
+        return GprnParts(sys.intern(parts[1]), None, None, None, None)
+    if nparts < 3 or not parts[2]:
         raise FormatError("'service' is mandatory")
-    parsed["service"] = svc
+    # environment, service and type-id come from tiny vocabularies: intern
+    # them so duplicates collapse and comparisons are pointer checks
+    environment = sys.intern(parts[1]) if parts[1] else "prd"  # default if not specified, empty means "prd"
+    service = sys.intern(parts[2])
     # remaining are optional parts
-    _ph = parts and parts.pop(0)
-    if _ph:
-        parsed["placeholder"] = _ph
-    type_id = parts and parts.pop(0)
-    if type_id:
-        parsed["type-id"] = type_id
-    res_id = parts and ":".join(parts)  # the resource-id can contain ":", we just take the remaining@
-    if res_id:
-        if not type_id:
-            raise FormatError("'resource-id' requires 'type-id'")
-        parsed["resource-id"] = res_id
+    placeholder = parts[3] if nparts > 3 and parts[3] else None
+    type_id = sys.intern(parts[4]) if nparts > 4 and parts[4] else None
+    res_id = parts[5] if nparts > 5 and parts[5] else None
+    if res_id and not type_id:
+        raise FormatError("'resource-id' requires 'type-id'")
 
-    return parsed
+    return GprnParts(environment, service, placeholder, type_id, res_id)
 
 
+# note: not cached on purpose, the project/changelog branches return plain
+# (mutable) dicts and callers must keep getting a fresh one
 def parse_resource_id(type_id, res_id):
     if res_id:
         if type_id == "artifact":
@@ -91,24 +91,28 @@ def unparse_resource_id(parsed, resource_id):
 
 
 def generate(dgprn):
-    try:
+    # read each field once and emit the fixed layout directly: no 6-slot
+    # list, no dict-driven assignment loop, no trailing-":" strip pass
+    env = dgprn.get("environment") or ""
+    if env == "prd":
         # normalize prd/""
-        if dgprn.get("environment") == "prd":
-            dgprn["environment"] = ""
-        idx = {"environment" : 1, "placeholder": 3, "type-id": 4, "resource-id": 5}
-        # if service not set, during join(), it will raise a TypeError => GPRNError, see below
-        lgprn = ["gprn","",dgprn.get("service"),"","",""]
-        for key,val in idx.items():
-            if dgprn.get(key):
-                lgprn[val] = dgprn[key]
-        gprn = ":".join(lgprn)
-        # remove extra : at the end, when some optional fields aren't set
-        gprn = gprn.rstrip(":")
-        return gprn
-    except KeyError as exc:
-        raise GPRNError(f"Missing key in GPRN dict: {exc}")
-    except TypeError as exc:
-        raise GPRNError(f"GRPN parts not properly set ({dgprn}): {exc}")
+        env = ""
+    svc = dgprn.get("service")
+    ph = dgprn.get("placeholder") or ""
+    tid = dgprn.get("type-id") or ""
+    rid = dgprn.get("resource-id") or ""
+    for part in (env, svc, ph, tid, rid):
+        if not isinstance(part, str):
+            # used to surface as a TypeError when joining the parts
+            raise GPRNError(f"GRPN parts not properly set ({dgprn}): expected string parts, got {part!r}")
+    if rid:
+        return f"gprn:{env}:{svc}:{ph}:{tid}:{rid}"
+    if tid:
+        return f"gprn:{env}:{svc}:{ph}:{tid}"
+    if ph:
+        return f"gprn:{env}:{svc}:{ph}"
+    # remove extra : at the end, when service/env aren't set
+    return f"gprn:{env}:{svc}".rstrip(":")
 
 
 def prepare_parents_list(parents):
@@ -117,25 +121,28 @@ def prepare_parents_list(parents):
     found_version = False
     for parent in parents:
         typ = None
-        if len(parent.split(":")) <= 2:
-            for each in parent.split(":"):
-                typ = "root" if each == "gprn" else "environment"
+        parts = parent.split(":")  # split once, reused below
+        if len(parts) <= 2:
+            # bare "gprn" is the root, anything else that short is an environment
+            typ = "root" if parts == ["gprn"] else "environment"
         else:
-            parsed = parse(parent)
-            typ = parsed["type-id"]
-            if parsed["type-id"] == "project":
+            parsed = parse(parent)  # cached
+            type_id = parsed.type_id
+            res_id = parsed.resource_id
+            typ = type_id
+            if type_id == "project":
                 typ = "projects"
-                if parsed["resource-id"]:
+                if res_id:
                     typ = "project"
-                    if not found_version and "@" in parsed["resource-id"]:
+                    if not found_version and "@" in res_id:
                         typ = "version"
                         found_version = True
-            elif parsed["type-id"] in ("changelog", "doc") and parsed["resource-id"]:
+            elif type_id in ("changelog", "doc") and res_id:
                 typ = "version"
-            if not parsed["type-id"]:
-                if parsed["service"]:
+            if not type_id:
+                if parsed.service:
                     typ = "service"
-                if not parsed["service"] and parsed["environment"]:
+                elif parsed.environment:
                     typ = "environment"
 
         # alright, so this is tricky there. Someone (me) got the wonderful idea to allow GPRN within
@@ -176,43 +183,50 @@ def get_parents(gprn, parents=None, deep=False):
         - gprn:dev                            (on dev environment) # only return if deep=True
         - gprn                                (part of the Genomics Platform) # only return if deep=True
     """
-    # stop condition: we ate enough of parts
-    if deep:  # if deep, return deep list of all possible values
-        if ":" not in gprn:
-            return prepare_parents_list(parents)
-    else:
-        if len(gprn.split(":")) < 4:
-            return prepare_parents_list(parents)
-
-    # validate method does not check for environment and service for API because we did not pass the gprn config.
-    parsed = validate(gprn)  # validate method validate the gprn and return the parsed value
-
-    resource_id = parse_resource_id(parsed["type-id"], parsed["resource-id"])
-    parsed["type-id"] = "project" if parsed["type-id"] == "artifact" else parsed["type-id"]
-    parent = None
-    if resource_id:
-        if resource_id.get("path"):
-            # resource_id an artifactdb ID, so parent is a project with a version.
-            # we just need to get rid of the "path" element.
-            parsed["resource-id"] = "{}@{}".format(resource_id["project_id"], resource_id["version"])
-        elif resource_id.get("version"):
-            # resource_id is a project+version, parent is project (alone)
-            parsed["resource-id"] = resource_id["project_id"]
-        else:
-            # resource_id is a project, so parent is the next gprn component up.
-            # ie. no resource-id anymore
-            parsed["resource-id"] = None
-        parent = generate(parsed)
-    if not parent:
-        # remove one GPRN part
-        # rstrip ":" to ignore empty part, like 'placeholder', or env=prd, skip it
-        parent = ":".join(gprn.split(":")[:-1]).strip(":")
-
     if parents is None:
         parents = []  # init, using None in signature to prevent add to a list by ref
-    parents.append(parent)
 
-    return get_parents(parent, parents=parents, deep=deep)
+    # iterate instead of recursing: one loop turn per ancestor, no extra
+    # frame per lineage level
+    cur = gprn
+    while True:
+        parts = cur.split(":")
+        # stop condition: we ate enough of parts
+        if deep:  # if deep, return deep list of all possible values
+            if len(parts) == 1:
+                break
+        elif len(parts) < 4:
+            break
+
+        # validate method does not check for environment and service for API because we did not pass the gprn config.
+        parsed = validate(cur)  # validate method validate the gprn and return the parsed value
+
+        resource_id = parse_resource_id(parsed["type-id"], parsed["resource-id"])
+        if parsed["type-id"] == "artifact":
+            parsed = parsed._replace(type_id="project")
+        parent = None
+        if resource_id:
+            if resource_id.get("path"):
+                # resource_id an artifactdb ID, so parent is a project with a version.
+                # we just need to get rid of the "path" element.
+                parsed = parsed._replace(resource_id="{}@{}".format(resource_id["project_id"], resource_id["version"]))
+            elif resource_id.get("version"):
+                # resource_id is a project+version, parent is project (alone)
+                parsed = parsed._replace(resource_id=resource_id["project_id"])
+            else:
+                # resource_id is a project, so parent is the next gprn component up.
+                # ie. no resource-id anymore
+                parsed = parsed._replace(resource_id=None)
+            parent = generate(parsed)
+        if not parent:
+            # remove one GPRN part
+            # rstrip ":" to ignore empty part, like 'placeholder', or env=prd, skip it
+            parent = ":".join(parts[:-1]).strip(":")
+
+        parents.append(parent)
+        cur = parent
+
+    return prepare_parents_list(parents)
 
 
 def get_lineage(gprn, deep=False):
@@ -225,7 +239,8 @@ def get_lineage(gprn, deep=False):
 
 
 def build(gprn_cfg, project_id=None, version=None, path=None):
-    dgprn = copy.deepcopy(gprn_cfg.to_dict())
+    # config dict only holds strings/None, a shallow copy is enough
+    dgprn = dict(gprn_cfg.to_dict())
     if path:
         assert version
         ids = {"project_id":project_id, "version": version, "path": path}
@@ -247,11 +262,11 @@ def build(gprn_cfg, project_id=None, version=None, path=None):
     return gprn
 
 
+@lru_cache(maxsize=4096)
 def validate(gprn, gprn_cfg=None):
     parsed = parse(gprn)
-    orig_parsed = copy.deepcopy(parsed)
     # normalize prd env to match gprn_cfg
-    parsed["environment"] = parsed['environment'] if parsed['environment'] != 'prd' else ''
+    env = parsed["environment"] if parsed["environment"] != "prd" else ""
     type_id = parsed["type-id"]
     if type_id and type_id not in VALID_TYPE_IDS:
         raise UnsupportedTypeID(f"Unsupported type-id: {type_id}")
@@ -260,9 +275,9 @@ def validate(gprn, gprn_cfg=None):
     if gprn_cfg:  # gprn config found then only it check for the environment and service related to API.
         if parsed["service"] != gprn_cfg.service:
             raise GPRNError("Invalid 'service' name: '{}'".format(parsed["service"]))
-        if parsed["environment"] != gprn_cfg.environment:
-            raise GPRNError("Invalid 'environment': '{}'".format(parsed["environment"]))
-    return orig_parsed  # untouched, directly coming from parse()
+        if env != gprn_cfg.environment:
+            raise GPRNError("Invalid 'environment': '{}'".format(env))
+    return parsed  # untouched (immutable), directly coming from parse()
 
 def lca(gprns,inner=False):
     """
@@ -293,12 +308,17 @@ def lca(gprns,inner=False):
 
     shortest = shortests[0]#.pop()
     shortest_lineage = lineages.pop(shortest)
+    # one set of GPRN strings per remaining lineage: the containment checks
+    # below become O(1) hash lookups instead of list scans
+    lineage_sets = [{elem["gprn"] for elem in lineage} for lineage in lineages.values()]
     lca_gprn = shortest_lineage[-1]  # at least, the lca is the root: {'type': 'root', 'gprn': 'gprn'}
-    # walk down from root to leaves, until we don't match anymore (ie. found lca)
-    for elem in shortest_lineage[::-1]:
-        for gprn,lineage in lineages.items():
-            if elem in lineage:
-                lca_gprn = elem
+    # walk up from the leaf: the first ancestor found in *every* other
+    # lineage is the LCA, anything above it can only be a higher ancestor,
+    # no need to keep walking
+    for elem in shortest_lineage:
+        if all(elem["gprn"] in lineage_set for lineage_set in lineage_sets):
+            lca_gprn = elem
+            break
 
     return lca_gprn["gprn"]
 